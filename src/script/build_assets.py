@@ -0,0 +1,155 @@
+import argparse
+import hashlib
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.normpath(os.path.join(SCRIPT_DIR, '..', '..'))
+CONFIG_DIR = os.path.join(ROOT_DIR, 'src', 'script-config')
+PUBLIC_DIR = os.path.join(ROOT_DIR, 'public')
+SOUND_CONFIG = os.path.join(PUBLIC_DIR, 'config', 'car-sound-config.json')
+STATE_FILE = os.path.join(ROOT_DIR, '.asset-build.json')
+
+GENERATOR_NAMES = ['engine', 'crash', 'horn', 'skid']
+
+def source_files(name):
+    return [os.path.join(SCRIPT_DIR, f"{name}.py"), os.path.join(SCRIPT_DIR, "kernels.py"),
+            os.path.join(SCRIPT_DIR, "export.py"), os.path.join(SCRIPT_DIR, "grains.py")]
+
+def load_assets():
+    with open(SOUND_CONFIG, 'r') as f:
+        sound_config = json.load(f)
+    assets = {}
+    for name in GENERATOR_NAMES:
+        path = sound_config.get(f"{name}SoundPath")
+        if path:
+            assets[name] = {
+                'config': os.path.join(CONFIG_DIR, f"{name}.json"),
+                'sources': source_files(name),
+                'output': os.path.join(PUBLIC_DIR, *path.strip('/').split('/')),
+            }
+    return assets
+
+def asset_digest(asset, grain_dir=None):
+    digest = hashlib.sha256()
+    digest.update(f"grains={os.path.abspath(grain_dir) if grain_dir else ''}".encode())
+    if grain_dir:
+        for filename in sorted(os.listdir(grain_dir)):
+            if filename.endswith('.npy'):
+                stat = os.stat(os.path.join(grain_dir, filename))
+                digest.update(f"{filename}:{stat.st_size}:{stat.st_mtime_ns}".encode())
+    for filename in [asset['config']] + asset['sources']:
+        digest.update(os.path.basename(filename).encode())
+        with open(filename, 'rb') as f:
+            digest.update(f.read())
+    return digest.hexdigest()
+
+def load_state():
+    if not os.path.exists(STATE_FILE):
+        return {}
+    with open(STATE_FILE, 'r') as f:
+        return json.load(f)
+
+def save_state(state):
+    with open(STATE_FILE, 'w') as f:
+        json.dump(state, f, indent=4)
+
+def stale_assets(assets, state, force=False, failed=None, grain_dir=None):
+    stale = {}
+    errors = []
+    for name, asset in assets.items():
+        try:
+            digest = asset_digest(asset, grain_dir)
+        except OSError as error:
+            print(f"Skipping {name}: {error}")
+            errors.append(name)
+            continue
+        if failed is not None and failed.get(name) == digest:
+            continue
+        if force or state.get(name) != digest or not os.path.exists(asset['output']):
+            stale[name] = digest
+    return stale, errors
+
+_grains = {}
+
+def _render_asset(name, config_file, output, grain_dir=None):
+    from export import load_config, render, save_wav
+    from grains import open_library
+    if grain_dir not in _grains:
+        _grains[grain_dir] = open_library(grain_dir)
+    config = load_config(name, config_file)
+    save_wav(render(name, config, _grains[grain_dir]), config.sample_rate, output)
+    return output
+
+def build(assets, state, force=False, workers=None, grain_dir=None, failed=None):
+    stale, failures = stale_assets(assets, state, force, failed, grain_dir)
+    if not stale:
+        return [], failures
+    rebuilt = []
+    with ProcessPoolExecutor(max_workers=workers or min(len(stale), os.cpu_count() or 1)) as executor:
+        futures = {name: executor.submit(_render_asset, name, assets[name]['config'],
+                                         assets[name]['output'], grain_dir)
+                   for name in stale}
+        for name, future in futures.items():
+            try:
+                output = future.result()
+            except Exception as error:
+                print(f"Failed to render {name}: {error}")
+                failures.append(name)
+                if failed is not None:
+                    failed[name] = stale[name]
+                continue
+            print(f"Rendered {os.path.relpath(output, ROOT_DIR)}")
+            state[name] = stale[name]
+            rebuilt.append(name)
+            if failed is not None:
+                failed.pop(name, None)
+    save_state(state)
+    return rebuilt, failures
+
+def build_atlas(rebuilt):
+    from pack_atlas import ATLAS_FILE, atlas_is_stale, pack_sound_config
+    if rebuilt or atlas_is_stale():
+        pack_sound_config()
+        print(f"Packed {os.path.relpath(ATLAS_FILE, ROOT_DIR)}")
+
+def watch(assets, state, interval, workers=None, grain_dir=None, atlas=False):
+    print(f"Watching {os.path.relpath(CONFIG_DIR, ROOT_DIR)} and generator sources, press Ctrl+C to stop")
+    failed = {}
+    while True:
+        rebuilt, failures = build(assets, state, workers=workers, grain_dir=grain_dir, failed=failed)
+        if atlas and not failures and not failed:
+            build_atlas(rebuilt)
+        time.sleep(interval)
+
+def main():
+    parser = argparse.ArgumentParser(description="Rebuild stale audio assets in public/assets/audio")
+    parser.add_argument("--watch", action="store_true", help="Keep polling for changes and rebuild stale assets")
+    parser.add_argument("--interval", type=float, default=0.5, help="Polling interval in seconds for watch mode")
+    parser.add_argument("--force", "-f", action="store_true", help="Rebuild every asset regardless of state")
+    parser.add_argument("--workers", "-w", type=int, help="Number of worker processes used for rendering")
+    parser.add_argument("--grains", "-g", help="Precomputed grain library directory shared by the workers")
+    parser.add_argument("--atlas", "-a", action="store_true", help="Pack the sound atlas after rebuilding assets")
+    args = parser.parse_args()
+
+    assets = load_assets()
+    state = load_state()
+    try:
+        if args.watch:
+            watch(assets, state, args.interval, args.workers, args.grains, args.atlas)
+        else:
+            rebuilt, failures = build(assets, state, args.force, args.workers, args.grains)
+            if failures:
+                print(f"Failed to build {', '.join(failures)}")
+                raise SystemExit(1)
+            if not rebuilt:
+                print("All assets are up to date")
+            if args.atlas:
+                build_atlas(rebuilt)
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
@@ -4,6 +4,7 @@ from scipy.io import wavfile
 from scipy import signal
 import json
 import os
+import kernels
 
 class CrashSoundConfig:
     def __init__(self, sample_rate=44100, duration=4.5, impact_amplitude=0.9, 
@@ -87,8 +88,9 @@ class CrashSoundConfig:
         return cls.from_dict(config_dict)
 
 class CrashSoundGenerator:
-    def __init__(self, config=None):
+    def __init__(self, config=None, grains=None):
         self.config = config or CrashSoundConfig()
+        self.grains = grains
         total_samples = int(self.config.sample_rate * self.config.duration)
         self.t = np.linspace(0, self.config.duration, total_samples, endpoint=False)
 
@@ -189,8 +191,11 @@ class CrashSoundGenerator:
             start_point = np.random.randint(int(0.2 * self.config.sample_rate), 
                                           int(0.8 * len(debris_sound) - burst_length))
             
-            burst = np.random.randn(burst_length) * 0.5
-            burst *= np.hanning(burst_length)
+            if self.grains:
+                burst = self.grains.noise_grain(burst_length) * 0.5
+            else:
+                burst = np.random.randn(burst_length) * 0.5
+                burst *= np.hanning(burst_length)
             
             freq_mod = np.random.uniform(0.7, 1.5)
             t_burst = np.linspace(0, burst_length/self.config.sample_rate, burst_length)
@@ -209,7 +214,7 @@ class CrashSoundGenerator:
         screech_t = np.linspace(0, self.config.tire_screech_duration, screech_samples)
         
         freq_sweep = np.linspace(self.config.screech_freq_start, self.config.screech_freq_end, screech_samples)
-        phase_integral = np.cumsum(freq_sweep) / self.config.sample_rate
+        phase_integral = kernels.phase_integral(freq_sweep, self.config.sample_rate)
         screech_sound = np.sin(2 * np.pi * phase_integral)
         
         screech_noise = np.random.randn(screech_samples) * 0.4
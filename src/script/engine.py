@@ -4,6 +4,7 @@ from scipy.io import wavfile
 from scipy import signal
 import json
 import os
+import kernels
 
 class EngineSoundConfig:
     def __init__(self, sample_rate=44100, duration=10, base_freq=120, rpm_variation=0.5, 
@@ -63,8 +64,9 @@ class EngineSoundConfig:
         return cls.from_dict(config_dict)
 
 class EngineSoundGenerator:
-    def __init__(self, config=None):
+    def __init__(self, config=None, grains=None):
         self.config = config or EngineSoundConfig()
+        self.grains = grains
         self.t = np.linspace(0, self.config.duration, int(self.config.sample_rate * self.config.duration), endpoint=False)
 
     def generate_engine_sound(self):
@@ -81,8 +83,8 @@ class EngineSoundGenerator:
         rpm_modulation = self.config.rpm_modulation_depth * np.sin(2 * np.pi * self.config.rpm_modulation_freq * self.t) + (1 - self.config.rpm_modulation_depth)
         freq_modulation = self.config.base_freq * (1 + self.config.rpm_variation * rpm_modulation)
         
+        phase_integral = kernels.phase_integral(freq_modulation, self.config.sample_rate)
         if self.config.seamless_loop:
-            phase_integral = np.cumsum(freq_modulation) / self.config.sample_rate
             phase_integral -= phase_integral[0]
             
             cycles = phase_integral[-1]
@@ -91,15 +93,12 @@ class EngineSoundGenerator:
             
             main_oscillator = np.sin(2 * np.pi * phase_integral)
         else:
-            main_oscillator = np.sin(2 * np.pi * np.cumsum(freq_modulation) / self.config.sample_rate)
+            main_oscillator = np.sin(2 * np.pi * phase_integral)
         
         harmonics = np.zeros_like(main_oscillator)
         for i, weight in enumerate(self.config.harmonic_weights, start=2):
-            if self.config.seamless_loop:
-                harmonic_phase = phase_integral * i
-                harmonics += weight * np.sin(2 * np.pi * harmonic_phase)
-            else:
-                harmonics += weight * np.sin(2 * np.pi * i * np.cumsum(freq_modulation) / self.config.sample_rate)
+            harmonic_phase = phase_integral * i
+            harmonics += weight * np.sin(2 * np.pi * harmonic_phase)
         
         return self.config.main_amplitude * main_oscillator + self.config.harmonic_amplitude * harmonics
 
@@ -109,14 +108,20 @@ class EngineSoundGenerator:
             return exhaust_sound
             
         for i in range(self.config.exhaust_notes):
-            note_freq = self.config.base_freq * (i + 1) * 0.5
             burst_points = np.random.choice(len(self.t), size=self.config.burst_count, replace=False)
-            for point in burst_points:
-                burst_length = np.random.randint(self.config.min_burst_length, self.config.max_burst_length)
-                if point + burst_length < len(exhaust_sound):
-                    burst = np.random.randn(burst_length) * 0.3
-                    burst *= np.hanning(burst_length)
-                    exhaust_sound[point:point+burst_length] += burst
+            burst_lengths = np.random.randint(self.config.min_burst_length, self.config.max_burst_length,
+                                              size=self.config.burst_count)
+            inside = burst_points + burst_lengths < len(exhaust_sound)
+            burst_points, burst_lengths = burst_points[inside], burst_lengths[inside]
+            if self.grains:
+                noise = self.grains.noise
+                offsets = self.grains.noise_offsets(burst_lengths)
+                windows = self.grains.hann
+            else:
+                noise = np.random.randn(burst_lengths.sum())
+                offsets = np.cumsum(burst_lengths) - burst_lengths
+                windows = None
+            kernels.add_windowed_bursts(exhaust_sound, burst_points, burst_lengths, noise, offsets, 0.3, windows)
         
         if self.config.seamless_loop:
             exhaust_sound = self._fade_exhaust_edges(exhaust_sound)
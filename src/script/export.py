@@ -0,0 +1,100 @@
+import argparse
+import numpy as np
+from scipy.io import wavfile
+from scipy import signal
+from concurrent.futures import ProcessPoolExecutor
+from math import gcd
+import os
+
+from engine import EngineSoundConfig, EngineSoundGenerator
+from crash import CrashSoundConfig, CrashSoundGenerator
+from horn import HornSoundConfig, HornSoundGenerator
+from skid import SkidSoundConfig, SkidSoundGenerator
+from grains import open_library
+
+GENERATORS = {
+    'engine': (EngineSoundConfig, EngineSoundGenerator, 'generate_engine_sound'),
+    'crash': (CrashSoundConfig, CrashSoundGenerator, 'generate_crash_sound'),
+    'horn': (HornSoundConfig, HornSoundGenerator, 'generate_horn_sound'),
+    'skid': (SkidSoundConfig, SkidSoundGenerator, 'generate_skid_sound'),
+}
+GRAIN_GENERATORS = ['engine', 'crash', 'skid']
+
+def load_config(name, filename=None):
+    config_class = GENERATORS[name][0]
+    if filename and os.path.exists(filename):
+        return config_class.load(filename)
+    return config_class()
+
+def create_generator(name, config, grains=None):
+    if name in GRAIN_GENERATORS:
+        return GENERATORS[name][1](config, grains)
+    return GENERATORS[name][1](config)
+
+def render_generator(name, generator):
+    audio = getattr(generator, GENERATORS[name][2])()
+    if name == 'engine':
+        audio = generator.apply_constant_envelope(audio)
+    return audio
+
+def render(name, config, grains=None):
+    return render_generator(name, create_generator(name, config, grains))
+
+def resample(audio, source_rate, target_rate, circular=False):
+    if source_rate == target_rate:
+        return audio
+    divisor = gcd(int(source_rate), int(target_rate))
+    up = int(target_rate) // divisor
+    down = int(source_rate) // divisor
+    if not circular:
+        return signal.resample_poly(audio, up, down)
+
+    half_length = 10 * max(up, down) // up + 1
+    pad = min(-(-half_length // down) * down, len(audio) // down * down)
+    padded = np.concatenate([audio[len(audio) - pad:], audio, audio[:pad]])
+    trim = pad * up // down
+    length = -(-len(audio) * up // down)
+    return signal.resample_poly(padded, up, down)[trim:trim + length]
+
+def save_wav(audio, sample_rate, filename):
+    wavfile.write(filename, sample_rate, np.int16(np.clip(audio, -1, 1) * 32767))
+
+def variant_filename(output, rate):
+    stem, ext = os.path.splitext(output)
+    return f"{stem}-{rate}{ext or '.wav'}"
+
+def _export_variant(audio, source_rate, target_rate, filename, circular=False):
+    save_wav(resample(audio, source_rate, target_rate, circular), target_rate, filename)
+    return filename
+
+def export_rates(audio, master_rate, rates, output, workers=None, circular=False):
+    filenames = [variant_filename(output, rate) for rate in rates]
+    with ProcessPoolExecutor(max_workers=workers or min(len(rates), os.cpu_count() or 1)) as executor:
+        futures = [executor.submit(_export_variant, audio, master_rate, rate, filename, circular)
+                   for rate, filename in zip(rates, filenames)]
+        return [future.result() for future in futures]
+
+def main():
+    parser = argparse.ArgumentParser(description="Render a sound once and export it at several sample rates")
+    parser.add_argument("generator", choices=sorted(GENERATORS), help="Sound generator to render")
+    parser.add_argument("--config", "-c", help="Configuration JSON file")
+    parser.add_argument("--output", "-o", help="Output WAV filename, the rate is appended to each variant")
+    parser.add_argument("--rates", "-r", type=int, nargs="+", default=[44100, 22050, 48000], help="Target sample rates in Hz")
+    parser.add_argument("--master-rate", "-m", type=int, help="Render rate, defaults to the highest target rate")
+    parser.add_argument("--workers", "-w", type=int, help="Number of worker processes used for resampling")
+    parser.add_argument("--grains", "-g", help="Precomputed grain library directory")
+    args = parser.parse_args()
+
+    if args.config and not os.path.exists(args.config):
+        print(f"Config file {args.config} not found, using default parameters")
+    config = load_config(args.generator, args.config)
+    config.sample_rate = args.master_rate or max(args.rates)
+
+    audio = render(args.generator, config, open_library(args.grains))
+    output = args.output or f"car-{args.generator}.wav"
+    circular = getattr(config, 'seamless_loop', False)
+    for filename in export_rates(audio, config.sample_rate, args.rates, output, args.workers, circular):
+        print(f"Saved {filename}")
+
+if __name__ == "__main__":
+    main()
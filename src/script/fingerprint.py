@@ -0,0 +1,194 @@
+import argparse
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+from scipy.io import wavfile
+from concurrent.futures import ProcessPoolExecutor
+import os
+
+FRAME_SIZE = 2048
+HOP_SIZE = 1024
+BAND_COUNT = 32
+SEGMENT_COUNT = 8
+MIN_FREQ = 50.0
+MAX_FREQ = 16000.0
+
+def _band_matrix(sample_rate, frame_size=FRAME_SIZE, band_count=BAND_COUNT):
+    freqs = np.fft.rfftfreq(frame_size, 1.0 / sample_rate)
+    edges = np.geomspace(MIN_FREQ, min(MAX_FREQ, 0.5 * sample_rate), band_count + 1)
+    bands = np.searchsorted(edges, freqs, side='right') - 1
+    matrix = np.zeros((len(freqs), band_count))
+    inside = (bands >= 0) & (bands < band_count)
+    matrix[np.flatnonzero(inside), bands[inside]] = 1.0
+    return matrix / np.maximum(matrix.sum(axis=0), 1.0)
+
+def compute_fingerprint(audio, sample_rate):
+    if len(audio) < FRAME_SIZE:
+        audio = np.pad(audio, (0, FRAME_SIZE - len(audio)))
+    frames = sliding_window_view(audio, FRAME_SIZE)[::HOP_SIZE] * np.hanning(FRAME_SIZE)
+    power = np.abs(np.fft.rfft(frames, axis=1)) ** 2
+    log_bands = np.log10(power @ _band_matrix(sample_rate) + 1e-10)
+
+    spectrum = log_bands.mean(axis=0)
+    spread = log_bands.std(axis=0)
+    frame_energy = log_bands.mean(axis=1)
+    if len(frame_energy) >= SEGMENT_COUNT:
+        envelope = np.array([segment.mean() for segment in np.array_split(frame_energy, SEGMENT_COUNT)])
+    else:
+        frame_positions = np.arange(len(frame_energy))
+        envelope = np.interp(np.linspace(0, len(frame_energy) - 1, SEGMENT_COUNT), frame_positions, frame_energy)
+
+    vector = np.concatenate([spectrum - spectrum.mean(), spread, envelope - envelope.mean()])
+    norm = np.linalg.norm(vector)
+    return (vector / norm if norm > 0 else vector).astype(np.float32)
+
+def read_audio(filename):
+    sample_rate, data = wavfile.read(filename)
+    if np.issubdtype(data.dtype, np.integer):
+        data = data / float(np.iinfo(data.dtype).max)
+    if data.ndim > 1:
+        data = data.mean(axis=1)
+    return sample_rate, data
+
+def fingerprint_file(filename):
+    sample_rate, audio = read_audio(filename)
+    return compute_fingerprint(audio, sample_rate)
+
+def index_filename(filename):
+    return filename if filename.endswith('.npz') else filename + '.npz'
+
+def collect_wav_files(paths):
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            for directory, _, names in os.walk(path):
+                files += [(os.path.relpath(os.path.join(directory, name), path), os.path.join(directory, name))
+                          for name in sorted(names) if name.lower().endswith('.wav')]
+        else:
+            files.append((os.path.basename(path), path))
+    return files
+
+class FingerprintIndex:
+    def __init__(self, keys=None, vectors=None):
+        self.keys = list(keys or [])
+        self.vectors = np.zeros((0, 2 * BAND_COUNT + SEGMENT_COUNT), dtype=np.float32) if vectors is None else vectors
+
+    def add(self, key, vector):
+        self.keys.append(key)
+        self.vectors = np.vstack([self.vectors, vector[None, :]])
+
+    def add_files(self, paths, workers=None):
+        files = collect_wav_files(paths)
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            vectors = list(executor.map(fingerprint_file, [filename for _, filename in files],
+                                        chunksize=max(1, len(files) // 64)))
+        if vectors:
+            self.keys += [key for key, _ in files]
+            self.vectors = np.vstack([self.vectors] + [vector[None, :] for vector in vectors])
+
+    def nearest(self, vector, count=5):
+        distances = 1.0 - self.vectors @ vector
+        count = min(count, len(distances))
+        closest = np.argpartition(distances, count - 1)[:count]
+        closest = closest[np.argsort(distances[closest])]
+        return [(self.keys[i], float(distances[i])) for i in closest]
+
+    def duplicates(self, threshold, chunk_size=1024):
+        redundant = {}
+        removed = np.zeros(len(self.keys), dtype=bool)
+        for start in range(0, len(self.keys), chunk_size):
+            similarity = self.vectors[start:start + chunk_size] @ self.vectors.T
+            for row, i in enumerate(range(start, min(start + chunk_size, len(self.keys)))):
+                if removed[i]:
+                    continue
+                matches = np.flatnonzero(1.0 - similarity[row, i + 1:] <= threshold) + i + 1
+                matches = matches[~removed[matches]]
+                removed[matches] = True
+                for j in matches:
+                    redundant[self.keys[j]] = self.keys[i]
+        return redundant
+
+    def compare(self, golden, tolerance):
+        positions = {key: i for i, key in enumerate(self.keys)}
+        changed = {}
+        missing = []
+        for j, key in enumerate(golden.keys):
+            i = positions.get(key)
+            if i is None:
+                missing.append(key)
+                continue
+            distance = 1.0 - float(self.vectors[i] @ golden.vectors[j])
+            if not np.isfinite(distance) or distance > tolerance:
+                changed[key] = distance
+        return changed, missing
+
+    def save(self, filename):
+        np.savez(index_filename(filename), keys=np.array(self.keys), vectors=self.vectors)
+
+    @classmethod
+    def load(cls, filename):
+        with np.load(index_filename(filename)) as data:
+            return cls([str(key) for key in data['keys']], data['vectors'])
+
+def _load_or_build(index_file, paths, workers):
+    if index_file and not paths:
+        if not os.path.exists(index_filename(index_file)):
+            raise SystemExit(f"Index file {index_filename(index_file)} does not exist, pass WAV paths to build one")
+        return FingerprintIndex.load(index_file)
+    index = FingerprintIndex()
+    index.add_files(paths, workers)
+    return index
+
+def main():
+    parser = argparse.ArgumentParser(description="Spectral fingerprints for variant dedup and regression checks")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    build_parser = subparsers.add_parser("build", help="Fingerprint WAV files into an index")
+    build_parser.add_argument("paths", nargs="+", help="WAV files or directories")
+    build_parser.add_argument("--index", "-i", default="fingerprints.npz", help="Index file to write")
+
+    query_parser = subparsers.add_parser("query", help="Find the closest indexed sounds")
+    query_parser.add_argument("input", help="WAV file to look up")
+    query_parser.add_argument("--index", "-i", default="fingerprints.npz", help="Index file to search")
+    query_parser.add_argument("--count", "-n", type=int, default=5, help="Number of neighbours to list")
+
+    dedup_parser = subparsers.add_parser("dedup", help="List near-identical variants")
+    dedup_parser.add_argument("paths", nargs="*", help="WAV files or directories, uses --index when omitted")
+    dedup_parser.add_argument("--index", "-i", default="fingerprints.npz", help="Index file to read")
+    dedup_parser.add_argument("--threshold", "-t", type=float, default=0.002, help="Maximum cosine distance of duplicates")
+
+    check_parser = subparsers.add_parser("check", help="Compare sounds against a golden index")
+    check_parser.add_argument("paths", nargs="+", help="WAV files or directories")
+    check_parser.add_argument("--golden", "-g", default="golden.npz", help="Golden index file")
+    check_parser.add_argument("--tolerance", "-t", type=float, default=0.02, help="Maximum cosine distance from golden")
+
+    for subparser in [build_parser, dedup_parser, check_parser]:
+        subparser.add_argument("--workers", "-w", type=int, help="Number of worker processes used for fingerprinting")
+    args = parser.parse_args()
+
+    if args.command == "build":
+        index = _load_or_build(None, args.paths, args.workers)
+        index.save(args.index)
+        print(f"Indexed {len(index.keys)} sounds into {index_filename(args.index)}")
+    elif args.command == "query":
+        index = FingerprintIndex.load(args.index)
+        for key, distance in index.nearest(fingerprint_file(args.input), args.count):
+            print(f"{distance:.4f}  {key}")
+    elif args.command == "dedup":
+        index = _load_or_build(args.index, args.paths, args.workers)
+        redundant = index.duplicates(args.threshold)
+        for key, original in redundant.items():
+            print(f"{key} duplicates {original}")
+        print(f"{len(redundant)} of {len(index.keys)} sounds are redundant")
+    elif args.command == "check":
+        index = _load_or_build(None, args.paths, args.workers)
+        changed, missing = index.compare(FingerprintIndex.load(args.golden), args.tolerance)
+        for key, distance in changed.items():
+            print(f"Changed: {key} (distance {distance:.4f})")
+        for key in missing:
+            print(f"Missing: {key}")
+        if changed or missing:
+            raise SystemExit(1)
+        print("All sounds match the golden set")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+import argparse
+import numpy as np
+from scipy import signal
+import os
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_GRAIN_DIR = os.path.join(SCRIPT_DIR, 'grains')
+
+FILTER_BANDS = [(800, 5000)]
+
+def _filtered_noise_filename(lowcut, highcut, sample_rate):
+    return f"bandpass_{lowcut}_{highcut}_{sample_rate}.npy"
+
+def build_library(directory, sample_rates, noise_length=2**20, max_grain_length=1024,
+                  filtered_duration=30, order=4):
+    os.makedirs(directory, exist_ok=True)
+    np.save(os.path.join(directory, 'noise.npy'), np.random.randn(noise_length))
+
+    hann = np.zeros((max_grain_length + 1, max_grain_length))
+    for length in range(1, max_grain_length + 1):
+        hann[length, :length] = np.hanning(length)
+    np.save(os.path.join(directory, 'hann.npy'), hann)
+
+    for sample_rate in sample_rates:
+        nyquist = 0.5 * sample_rate
+        white_noise = np.random.randn(int(filtered_duration * sample_rate))
+        for lowcut, highcut in FILTER_BANDS:
+            b, a = signal.butter(order, [lowcut / nyquist, highcut / nyquist], btype='band')
+            np.save(os.path.join(directory, _filtered_noise_filename(lowcut, highcut, sample_rate)),
+                    signal.lfilter(b, a, white_noise))
+
+class GrainLibrary:
+    def __init__(self, directory=DEFAULT_GRAIN_DIR):
+        self.directory = directory
+        self.noise = np.load(os.path.join(directory, 'noise.npy'), mmap_mode='r')
+        self.hann = np.load(os.path.join(directory, 'hann.npy'), mmap_mode='r')
+        self.max_grain_length = self.hann.shape[1]
+        self._filtered = {}
+
+    def noise_grain(self, length):
+        if length > self.max_grain_length or length > len(self.noise):
+            return np.random.randn(length) * np.hanning(length)
+        offset = np.random.randint(0, len(self.noise) - length + 1)
+        return self.noise[offset:offset + length] * self.hann[length, :length]
+
+    def noise_offsets(self, lengths):
+        return np.random.randint(0, len(self.noise) - np.asarray(lengths) + 1)
+
+    def filtered_noise(self, lowcut, highcut, sample_rate, length):
+        key = (lowcut, highcut, sample_rate)
+        if key not in self._filtered:
+            filename = os.path.join(self.directory, _filtered_noise_filename(lowcut, highcut, sample_rate))
+            self._filtered[key] = np.load(filename, mmap_mode='r') if os.path.exists(filename) else None
+        noise = self._filtered[key]
+        if noise is None or length > len(noise):
+            return None
+        offset = np.random.randint(0, len(noise) - length + 1)
+        return np.array(noise[offset:offset + length])
+
+def open_library(directory):
+    return GrainLibrary(directory) if directory else None
+
+def main():
+    parser = argparse.ArgumentParser(description="Precompute the noise grain library used by the generators")
+    parser.add_argument("--output-dir", "-o", default=DEFAULT_GRAIN_DIR, help="Directory for the .npy grain files")
+    parser.add_argument("--rates", "-r", type=int, nargs="+", default=[44100, 48000, 22050], help="Sample rates for filtered noise")
+    parser.add_argument("--max-grain-length", type=int, default=1024, help="Longest precomputed grain in samples")
+    parser.add_argument("--filtered-duration", type=float, default=30, help="Length of each filtered noise bank in seconds")
+    args = parser.parse_args()
+
+    build_library(args.output_dir, args.rates, max_grain_length=args.max_grain_length,
+                  filtered_duration=args.filtered_duration)
+    print(f"Grain library saved to {args.output_dir}")
+
+if __name__ == "__main__":
+    main()
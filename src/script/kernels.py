@@ -0,0 +1,191 @@
+import argparse
+import numpy as np
+from scipy import signal
+import os
+import time
+
+BACKENDS = ['numpy', 'numba']
+
+def _numpy_phase_integral(freq, sample_rate):
+    return np.cumsum(freq) / sample_rate
+
+def _numpy_iir_filter(b, a, audio):
+    return signal.lfilter(b, a, audio)
+
+def _numpy_add_windowed_bursts(out, starts, lengths, noise, offsets, scale, windows=None):
+    for start, length, offset in zip(starts, lengths, offsets):
+        if windows is not None and length < len(windows):
+            window = windows[length, :length]
+        else:
+            window = np.hanning(length)
+        out[start:start + length] += noise[offset:offset + length] * window * scale
+    return out
+
+def _load_numba_kernels():
+    import numba
+
+    @numba.njit
+    def phase_integral(freq, sample_rate):
+        phase = np.empty(len(freq))
+        total = 0.0
+        for i in range(len(freq)):
+            total += freq[i]
+            phase[i] = total / sample_rate
+        return phase
+
+    @numba.njit
+    def iir_filter(b, a, audio):
+        order = max(len(b), len(a))
+        b_norm = np.zeros(order)
+        a_norm = np.zeros(order)
+        b_norm[:len(b)] = b / a[0]
+        a_norm[:len(a)] = a / a[0]
+        state = np.zeros(order)
+        out = np.empty(len(audio))
+        for n in range(len(audio)):
+            x = audio[n]
+            y = b_norm[0] * x + state[0]
+            for k in range(1, order):
+                state[k - 1] = b_norm[k] * x - a_norm[k] * y + state[k]
+            out[n] = y
+        return out
+
+    @numba.njit
+    def add_windowed_bursts(out, starts, lengths, noise, offsets, scale, windows):
+        for i in range(len(starts)):
+            length = lengths[i]
+            for k in range(length):
+                if length < windows.shape[0]:
+                    window = windows[length, k]
+                else:
+                    window = 1.0 if length == 1 else 0.5 - 0.5 * np.cos(2.0 * np.pi * k / (length - 1))
+                out[starts[i] + k] += noise[offsets[i] + k] * window * scale
+        return out
+
+    def add_windowed_bursts_array(out, starts, lengths, noise, offsets, scale, windows=None):
+        windows = np.zeros((0, 0)) if windows is None else np.asarray(windows, dtype=np.float64)
+        return add_windowed_bursts(out, np.asarray(starts, dtype=np.int64), np.asarray(lengths, dtype=np.int64),
+                                   np.asarray(noise, dtype=np.float64), np.asarray(offsets, dtype=np.int64),
+                                   float(scale), windows)
+
+    def iir_filter_array(b, a, audio):
+        return iir_filter(np.asarray(b, dtype=np.float64), np.asarray(a, dtype=np.float64),
+                          np.asarray(audio, dtype=np.float64))
+
+    def phase_integral_array(freq, sample_rate):
+        return phase_integral(np.asarray(freq, dtype=np.float64), float(sample_rate))
+
+    return {
+        'phase_integral': phase_integral_array,
+        'iir_filter': iir_filter_array,
+        'add_windowed_bursts': add_windowed_bursts_array,
+    }
+
+_kernels = {
+    'numpy': {
+        'phase_integral': _numpy_phase_integral,
+        'iir_filter': _numpy_iir_filter,
+        'add_windowed_bursts': _numpy_add_windowed_bursts,
+    }
+}
+_backend = 'numpy'
+
+def load_backend(name):
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown kernel backend: {name}")
+    if name not in _kernels:
+        try:
+            _kernels[name] = _load_numba_kernels()
+        except ImportError:
+            raise RuntimeError("The numba kernel backend requires the numba package")
+    return _kernels[name]
+
+def set_backend(name):
+    global _backend
+    load_backend(name)
+    _backend = name
+
+def get_backend():
+    return _backend
+
+def phase_integral(freq, sample_rate):
+    return _kernels[_backend]['phase_integral'](freq, sample_rate)
+
+def iir_filter(b, a, audio):
+    return _kernels[_backend]['iir_filter'](b, a, audio)
+
+def add_windowed_bursts(out, starts, lengths, noise, offsets, scale, windows=None):
+    return _kernels[_backend]['add_windowed_bursts'](out, starts, lengths, noise, offsets, scale, windows)
+
+if os.environ.get('KERNEL_BACKEND'):
+    set_backend(os.environ['KERNEL_BACKEND'])
+
+def _kernel_inputs(sample_rate=44100, duration=10, burst_count=6000):
+    samples = int(sample_rate * duration)
+    freq = 120 * (1 + 0.3 * np.random.randn(samples))
+    audio = np.random.randn(samples)
+    b, a = signal.butter(4, [800 / (0.5 * sample_rate), 5000 / (0.5 * sample_rate)], btype='band')
+    lengths = np.random.randint(50, 200, size=burst_count)
+    starts = np.random.randint(0, samples - 200, size=burst_count)
+    offsets = np.concatenate([[0], np.cumsum(lengths)[:-1]])
+    noise = np.random.randn(lengths.sum())
+    windows = np.zeros((151, 150))
+    for length in range(1, 151):
+        windows[length, :length] = np.hanning(length)
+    return {
+        'phase_integral': (freq, sample_rate),
+        'iir_filter': (b, a, audio),
+        'add_windowed_bursts': (samples, starts, lengths, noise, offsets, 0.3, windows),
+    }
+
+def _call(kernels, name, args):
+    if name == 'add_windowed_bursts':
+        return kernels[name](np.zeros(args[0]), *args[1:])
+    return kernels[name](*args)
+
+def check_parity(backend, tolerance=1e-9):
+    reference = load_backend('numpy')
+    candidate = load_backend(backend)
+    failed = False
+    for name, args in _kernel_inputs(duration=2, burst_count=500).items():
+        expected = _call(reference, name, args)
+        actual = _call(candidate, name, args)
+        error = np.max(np.abs(expected - actual)) / max(np.max(np.abs(expected)), 1e-12)
+        status = "ok" if error <= tolerance else "MISMATCH"
+        failed = failed or error > tolerance
+        print(f"{name:>20}: max relative error {error:.2e} {status}")
+    return not failed
+
+def benchmark(backend, repeats=5):
+    reference = load_backend('numpy')
+    start = time.perf_counter()
+    candidate = load_backend(backend)
+    load_time = time.perf_counter() - start
+    print(f"{backend} backend import: {load_time * 1000:.1f} ms")
+    for name, args in _kernel_inputs().items():
+        start = time.perf_counter()
+        _call(candidate, name, args)
+        first_call = time.perf_counter() - start
+        timings = {}
+        for label, kernels in [('numpy', reference), (backend, candidate)]:
+            start = time.perf_counter()
+            for _ in range(repeats):
+                _call(kernels, name, args)
+            timings[label] = (time.perf_counter() - start) / repeats
+        print(f"{name:>20}: numpy {timings['numpy'] * 1000:8.2f} ms  {backend} {timings[backend] * 1000:8.2f} ms  "
+              f"speedup {timings['numpy'] / timings[backend]:6.2f}x  first call {first_call * 1000:8.1f} ms")
+
+def main():
+    parser = argparse.ArgumentParser(description="Check and benchmark the DSP kernel backends")
+    parser.add_argument("--backend", "-b", default="numba", choices=BACKENDS, help="Backend compared against numpy")
+    parser.add_argument("--check", action="store_true", help="Compare kernel outputs with the numpy backend")
+    parser.add_argument("--benchmark", action="store_true", help="Time each kernel and the first-call compile cost")
+    args = parser.parse_args()
+
+    if args.benchmark or not args.check:
+        benchmark(args.backend)
+    if args.check and not check_parity(args.backend):
+        raise SystemExit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+import argparse
+import json
+import os
+import wave
+import numpy as np
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.normpath(os.path.join(SCRIPT_DIR, '..', '..'))
+PUBLIC_DIR = os.path.join(ROOT_DIR, 'public')
+SOUND_CONFIG = os.path.join(PUBLIC_DIR, 'config', 'car-sound-config.json')
+ATLAS_FILE = os.path.join(PUBLIC_DIR, 'assets', 'audio', 'sound-atlas.wav')
+MANIFEST_FILE = os.path.join(PUBLIC_DIR, 'config', 'sound-atlas.json')
+
+CAR_SOUNDS = ['engine', 'crash', 'horn', 'skid']
+LOOPED_CAR_SOUNDS = ['engine', 'skid']
+EXTRA_SOUNDS = [('click-sound', '/assets/audio/click.wav'), ('melody', '/assets/audio/melody.wav')]
+LOOPED_EXTRA_SOUNDS = ['melody']
+
+def public_file(path):
+    return os.path.join(PUBLIC_DIR, *path.strip('/').split('/'))
+
+def public_path(filename):
+    relative = os.path.relpath(os.path.abspath(filename), PUBLIC_DIR)
+    if relative.startswith('..'):
+        return os.path.basename(filename)
+    return '/' + relative.replace(os.sep, '/')
+
+def default_sounds(sound_config):
+    sounds = [(sound_config[f"{name}SoundKey"], public_file(sound_config[f"{name}SoundPath"]))
+              for name in CAR_SOUNDS if f"{name}SoundKey" in sound_config]
+    loops = [sound_config[f"{name}SoundKey"] for name in LOOPED_CAR_SOUNDS if f"{name}SoundKey" in sound_config]
+    return sounds + [(key, public_file(path)) for key, path in EXTRA_SOUNDS], loops + LOOPED_EXTRA_SOUNDS
+
+def read_header(filename):
+    with wave.open(filename, 'rb') as reader:
+        if reader.getsampwidth() != 2:
+            raise ValueError(f"{filename} is not 16-bit PCM")
+        return reader.getframerate(), reader.getnframes()
+
+def read_chunks(filename, chunk_frames):
+    with wave.open(filename, 'rb') as reader:
+        channels = reader.getnchannels()
+        while True:
+            data = reader.readframes(chunk_frames)
+            if not data:
+                break
+            samples = np.frombuffer(data, dtype='<i2')
+            if channels > 1:
+                samples = samples.reshape(-1, channels).mean(axis=1).astype('<i2')
+            yield samples
+
+def aligned(position, align):
+    return -(-position // align) * align
+
+def pack_atlas(sounds, output, loops=(), align=1024, gap=0, chunk_frames=65536):
+    if not sounds:
+        raise ValueError("No sounds to pack")
+    headers = [read_header(filename) for _, filename in sounds]
+    sample_rate = headers[0][0]
+    for (_, filename), (rate, _) in zip(sounds, headers):
+        if rate != sample_rate:
+            raise ValueError(f"{filename} is {rate} Hz, the atlas is {sample_rate} Hz")
+
+    sprites = []
+    position = 0
+    with wave.open(output, 'wb') as writer:
+        writer.setnchannels(1)
+        writer.setsampwidth(2)
+        writer.setframerate(sample_rate)
+        for key, filename in sounds:
+            offset = aligned(position, align)
+            writer.writeframes(bytes(2 * (offset - position)))
+            length = 0
+            for samples in read_chunks(filename, chunk_frames):
+                writer.writeframes(samples.tobytes())
+                length += len(samples)
+            sprite = {'key': key, 'offset': offset, 'length': length}
+            if key in loops:
+                sprite['loopStart'] = offset
+                sprite['loopEnd'] = offset + length
+            sprites.append(sprite)
+            position = offset + length
+            writer.writeframes(bytes(2 * gap))
+            position += gap
+    return sample_rate, sprites
+
+def build_manifest(sound_config, atlas_path, sample_rate, sprites):
+    return {
+        **sound_config,
+        'atlasPath': atlas_path,
+        'atlasSampleRate': sample_rate,
+        'sprites': sprites
+    }
+
+def pack_sound_config(output=ATLAS_FILE, manifest_file=MANIFEST_FILE, sounds=None, loops=None,
+                      align=1024, gap=0):
+    with open(SOUND_CONFIG, 'r') as f:
+        sound_config = json.load(f)
+    default_sound_list, default_loops = default_sounds(sound_config)
+    sample_rate, sprites = pack_atlas(sounds or default_sound_list, output,
+                                      default_loops if loops is None else loops, align, gap)
+    with open(manifest_file, 'w') as f:
+        json.dump(build_manifest(sound_config, public_path(output), sample_rate, sprites), f, indent=4)
+    return sprites
+
+def atlas_is_stale(output=ATLAS_FILE, manifest_file=MANIFEST_FILE):
+    if not os.path.exists(output) or not os.path.exists(manifest_file):
+        return True
+    with open(SOUND_CONFIG, 'r') as f:
+        sounds, _ = default_sounds(json.load(f))
+    packed_at = min(os.path.getmtime(output), os.path.getmtime(manifest_file))
+    inputs = [SOUND_CONFIG, __file__] + [filename for _, filename in sounds]
+    return any(os.path.getmtime(filename) > packed_at for filename in inputs)
+
+def parse_sound(value):
+    key, separator, path = value.partition('=')
+    if not separator:
+        raise argparse.ArgumentTypeError(f"Expected KEY=PATH, got {value}")
+    return key, path
+
+def main():
+    parser = argparse.ArgumentParser(description="Pack rendered sounds into one audio sprite atlas")
+    parser.add_argument("--sound", "-s", type=parse_sound, action="append", metavar="KEY=PATH",
+                        help="Sound to pack, defaults to the car sounds plus click and melody")
+    parser.add_argument("--loop", "-l", action="append", metavar="KEY", help="Key that gets loop points")
+    parser.add_argument("--output", "-o", default=ATLAS_FILE, help="Atlas WAV filename")
+    parser.add_argument("--manifest", "-m", default=MANIFEST_FILE, help="Manifest JSON filename")
+    parser.add_argument("--align", type=int, default=1024, help="Sprite offset alignment in samples")
+    parser.add_argument("--gap", type=int, default=0, help="Silent samples after each sprite")
+    args = parser.parse_args()
+
+    sprites = pack_sound_config(args.output, args.manifest, args.sound, args.loop, args.align, args.gap)
+    print(f"Packed {len(sprites)} sounds into {args.output}, manifest saved to {args.manifest}")
+
+if __name__ == "__main__":
+    main()
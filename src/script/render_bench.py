@@ -0,0 +1,85 @@
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+
+from render_server import RenderClient, DEFAULT_HOST
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+CONFIG_DIR = os.path.join(SCRIPT_DIR, '..', 'script-config')
+
+def _run_cli(generator, config_file, output):
+    start = time.perf_counter()
+    subprocess.run([sys.executable, os.path.join(SCRIPT_DIR, f"{generator}.py"),
+                    "--config", config_file, "--output", output],
+                   check=True, stdout=subprocess.DEVNULL)
+    return time.perf_counter() - start
+
+def bench_cli(generator, requests, clients, workdir):
+    config_file = os.path.join(CONFIG_DIR, f"{generator}.json")
+    outputs = [os.path.join(workdir, f"cli-{i}.wav") for i in range(requests)]
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=clients) as executor:
+        latencies = list(executor.map(lambda output: _run_cli(generator, config_file, output), outputs))
+    return latencies, time.perf_counter() - start
+
+def _client_session(generator, config, count, port):
+    client = RenderClient(port=port)
+    latencies = []
+    try:
+        for _ in range(count):
+            start = time.perf_counter()
+            client.render(generator, config)
+            latencies.append(time.perf_counter() - start)
+    finally:
+        client.close()
+    return latencies
+
+def bench_server(generator, requests, clients, port):
+    from export import load_config
+    config = load_config(generator, os.path.join(CONFIG_DIR, f"{generator}.json")).to_dict()
+    counts = [requests // clients + (1 if i < requests % clients else 0) for i in range(clients)]
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=clients) as executor:
+        sessions = list(executor.map(lambda count: _client_session(generator, config, count, port), counts))
+    return [latency for session in sessions for latency in session], time.perf_counter() - start
+
+def start_server(port, workers):
+    command = [sys.executable, os.path.join(SCRIPT_DIR, "render_server.py"), "--port", str(port)]
+    if workers:
+        command += ["--workers", str(workers)]
+    process = subprocess.Popen(command, stdout=subprocess.PIPE, text=True)
+    process.stdout.readline()
+    return process
+
+def report(label, latencies, elapsed):
+    latencies = np.array(latencies) * 1000
+    print(f"{label:>8}: mean {latencies.mean():8.1f} ms  p95 {np.percentile(latencies, 95):8.1f} ms  "
+          f"throughput {len(latencies) / elapsed:6.2f} renders/s")
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare render latency of the CLI scripts and the render server")
+    parser.add_argument("--generator", "-g", default="horn", help="Sound generator to benchmark")
+    parser.add_argument("--requests", "-n", type=int, default=32, help="Total number of renders")
+    parser.add_argument("--clients", "-c", type=int, nargs="+", default=[1, 4], help="Concurrent client counts")
+    parser.add_argument("--port", "-p", type=int, default=8766, help="TCP port for the benchmark server")
+    parser.add_argument("--workers", "-w", type=int, help="Number of render server worker processes")
+    args = parser.parse_args()
+
+    server = start_server(args.port, args.workers)
+    try:
+        with tempfile.TemporaryDirectory() as workdir:
+            for clients in args.clients:
+                print(f"{args.generator}, {args.requests} renders, {clients} concurrent clients ({DEFAULT_HOST}:{args.port})")
+                report("cli", *bench_cli(args.generator, args.requests, clients, workdir))
+                report("server", *bench_server(args.generator, args.requests, clients, args.port))
+    finally:
+        server.terminate()
+        server.wait()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+import argparse
+import asyncio
+import io
+import json
+import os
+import signal
+import socket
+import sys
+from functools import lru_cache
+import numpy as np
+from scipy.io import wavfile
+from concurrent.futures import ProcessPoolExecutor
+
+from export import GENERATORS, create_generator, render_generator
+from grains import open_library
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8765
+GENERATOR_CACHE_SIZE = 8
+
+_grains = None
+
+@lru_cache(maxsize=GENERATOR_CACHE_SIZE)
+def _cached_generator(name, config_json):
+    config_class = GENERATORS[name][0]
+    config = config_class.from_dict({**config_class().to_dict(), **json.loads(config_json)})
+    return create_generator(name, config, _grains)
+
+def _get_generator(name, config_dict):
+    return _cached_generator(name, json.dumps(config_dict, sort_keys=True))
+
+def _warm_worker(grain_dir=None):
+    global _grains
+    np.random.seed()
+    if grain_dir and _grains is None:
+        _grains = open_library(grain_dir)
+    for name in GENERATORS:
+        _get_generator(name, {})
+
+def _render_request(name, config_dict, output=None):
+    generator = _get_generator(name, config_dict)
+    audio = render_generator(name, generator)
+    pcm = np.int16(audio * 32767)
+    if output:
+        wavfile.write(output, generator.config.sample_rate, pcm)
+        return None
+    buffer = io.BytesIO()
+    wavfile.write(buffer, generator.config.sample_rate, pcm)
+    return buffer.getvalue()
+
+class RenderServer:
+    def __init__(self, workers=None, grain_dir=None):
+        self.workers = workers or os.cpu_count() or 1
+        self.executor = ProcessPoolExecutor(max_workers=self.workers, initializer=_warm_worker,
+                                            initargs=(grain_dir,))
+
+    async def handle(self, reader, writer):
+        loop = asyncio.get_running_loop()
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                try:
+                    request = json.loads(line)
+                    name = request['generator']
+                    if name not in GENERATORS:
+                        raise ValueError(f"Unknown generator: {name}")
+                    output = request.get('output')
+                    if output and not os.path.isabs(output):
+                        raise ValueError(f"Output path must be absolute: {output}")
+                    wav = await loop.run_in_executor(self.executor, _render_request,
+                                                     name, request.get('config', {}), output)
+                except Exception as error:
+                    writer.write(json.dumps({'status': 'error', 'message': str(error)}).encode() + b'\n')
+                else:
+                    if output:
+                        writer.write(json.dumps({'status': 'ok', 'path': output}).encode() + b'\n')
+                    else:
+                        writer.write(json.dumps({'status': 'ok', 'length': len(wav)}).encode() + b'\n')
+                        writer.write(wav)
+                await writer.drain()
+        finally:
+            writer.close()
+
+    async def serve(self, socket_path=None, host=DEFAULT_HOST, port=DEFAULT_PORT):
+        if socket_path:
+            if os.path.exists(socket_path):
+                os.remove(socket_path)
+            server = await asyncio.start_unix_server(self.handle, path=socket_path)
+        else:
+            server = await asyncio.start_server(self.handle, host=host, port=port)
+        await asyncio.gather(*[asyncio.wrap_future(self.executor.submit(_warm_worker))
+                               for _ in range(self.workers)])
+        print(f"Render server listening on {socket_path or f'{host}:{port}'}", flush=True)
+        async with server:
+            await server.serve_forever()
+
+    def close(self):
+        self.executor.shutdown()
+
+class RenderClient:
+    def __init__(self, socket_path=None, host=DEFAULT_HOST, port=DEFAULT_PORT):
+        if socket_path:
+            self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            self.sock.connect(socket_path)
+        else:
+            self.sock = socket.create_connection((host, port))
+        self.stream = self.sock.makefile('rb')
+
+    def render(self, generator, config=None, output=None):
+        request = {'generator': generator, 'config': config or {}}
+        if output:
+            request['output'] = os.path.abspath(output)
+        self.sock.sendall(json.dumps(request).encode() + b'\n')
+        response = json.loads(self.stream.readline())
+        if response['status'] != 'ok':
+            raise RuntimeError(response['message'])
+        if 'length' in response:
+            return self.stream.read(response['length'])
+        return response['path']
+
+    def close(self):
+        self.stream.close()
+        self.sock.close()
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve sound renders from warm worker processes")
+    parser.add_argument("--socket", "-s", help="Unix socket path, listens on TCP when omitted")
+    parser.add_argument("--host", default=DEFAULT_HOST, help="TCP host to listen on")
+    parser.add_argument("--port", "-p", type=int, default=DEFAULT_PORT, help="TCP port to listen on")
+    parser.add_argument("--workers", "-w", type=int, help="Number of render worker processes")
+    parser.add_argument("--grains", "-g", help="Precomputed grain library directory shared by the workers")
+    args = parser.parse_args()
+
+    server = RenderServer(args.workers, args.grains)
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+    try:
+        asyncio.run(server.serve(args.socket, args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.close()
+
+if __name__ == "__main__":
+    main()
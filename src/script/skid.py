@@ -4,6 +4,8 @@ from scipy.io import wavfile
 from scipy import signal
 import json
 import os
+from functools import lru_cache
+import kernels
 
 class SkidSoundConfig:
     def __init__(self, sample_rate=44100, duration=3, base_freq=200, 
@@ -57,9 +59,17 @@ class SkidSoundConfig:
             config_dict = json.load(f)
         return cls.from_dict(config_dict)
 
+@lru_cache(maxsize=None)
+def _design_bandpass(lowcut, highcut, sample_rate, order):
+    nyquist = 0.5 * sample_rate
+    low = lowcut / nyquist
+    high = highcut / nyquist
+    return signal.butter(order, [low, high], btype='band')
+
 class SkidSoundGenerator:
-    def __init__(self, config=None):
+    def __init__(self, config=None, grains=None):
         self.config = config or SkidSoundConfig()
+        self.grains = grains
         self.t = np.linspace(0, self.config.duration, int(self.config.sample_rate * self.config.duration), endpoint=False)
 
     def generate_skid_sound(self):
@@ -77,19 +87,23 @@ class SkidSoundGenerator:
         return self._normalize_audio(enveloped)
 
     def _generate_noise_component(self):
-        white_noise = np.random.randn(len(self.t))
-        filtered_noise = self._apply_bandpass_filter(white_noise, 800, 5000)
+        filtered_noise = None
+        if self.grains:
+            filtered_noise = self.grains.filtered_noise(800, 5000, self.config.sample_rate, len(self.t))
+        if filtered_noise is None:
+            white_noise = np.random.randn(len(self.t))
+            filtered_noise = self._apply_bandpass_filter(white_noise, 800, 5000)
         textured_noise = self._apply_texture_variation(filtered_noise)
         return textured_noise
 
     def _generate_tone_component(self):
         freq_modulation = self.config.base_freq * (1 + self.config.freq_variation * np.random.randn(len(self.t)))
-        phase_integral = np.cumsum(freq_modulation) / self.config.sample_rate
+        phase_integral = kernels.phase_integral(freq_modulation, self.config.sample_rate)
         return np.sin(2 * np.pi * phase_integral)
 
     def _generate_rumble_component(self):
         rumble_freq = np.random.uniform(self.config.rumble_freq_low, self.config.rumble_freq_high, len(self.t))
-        phase_integral = np.cumsum(rumble_freq) / self.config.sample_rate
+        phase_integral = kernels.phase_integral(rumble_freq, self.config.sample_rate)
         return np.sin(2 * np.pi * phase_integral)
 
     def _generate_amplitude_envelope(self):
@@ -110,11 +124,8 @@ class SkidSoundGenerator:
         return np.concatenate([attack, sustain, release])
 
     def _apply_bandpass_filter(self, audio, lowcut, highcut, order=4):
-        nyquist = 0.5 * self.config.sample_rate
-        low = lowcut / nyquist
-        high = highcut / nyquist
-        b, a = signal.butter(order, [low, high], btype='band')
-        return signal.lfilter(b, a, audio)
+        b, a = _design_bandpass(lowcut, highcut, self.config.sample_rate, order)
+        return kernels.iir_filter(b, a, audio)
 
     def _apply_texture_variation(self, audio):
         variation_samples = int(0.1 * self.config.sample_rate)
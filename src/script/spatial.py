@@ -0,0 +1,180 @@
+import argparse
+import numpy as np
+from scipy.io import wavfile
+import json
+import os
+import time
+
+class SpatialConfig:
+    def __init__(self, channels=2, speaker_angles=None, speed_of_sound=343.0,
+                 reference_distance=1.0, block_size=8192):
+        self.channels = channels
+        self.speaker_angles = speaker_angles or default_speaker_angles(channels)
+        if len(self.speaker_angles) != channels:
+            raise ValueError(f"Expected {channels} speaker angles, got {len(self.speaker_angles)}")
+        self.speed_of_sound = speed_of_sound
+        self.reference_distance = reference_distance
+        self.block_size = block_size
+
+    def to_dict(self):
+        return {
+            'channels': self.channels,
+            'speaker_angles': self.speaker_angles,
+            'speed_of_sound': self.speed_of_sound,
+            'reference_distance': self.reference_distance,
+            'block_size': self.block_size
+        }
+
+    @classmethod
+    def from_dict(cls, config_dict):
+        return cls(**config_dict)
+
+    def save(self, filename):
+        with open(filename, 'w') as f:
+            json.dump(self.to_dict(), f, indent=4)
+
+    @classmethod
+    def load(cls, filename):
+        with open(filename, 'r') as f:
+            config_dict = json.load(f)
+        return cls.from_dict(config_dict)
+
+def default_speaker_angles(channels):
+    if channels == 1:
+        return [0.0]
+    if channels == 2:
+        return [-90.0, 90.0]
+    return [float(angle) for angle in np.arange(channels) * 360.0 / channels - 180.0 / channels]
+
+class Trajectory:
+    def __init__(self, times, positions):
+        self.times = np.asarray(times, dtype=float)
+        self.positions = np.asarray(positions, dtype=float)
+
+    def positions_at(self, t):
+        x = np.interp(t, self.times, self.positions[:, 0])
+        y = np.interp(t, self.times, self.positions[:, 1])
+        return x, y
+
+    def to_dict(self):
+        return {
+            'keyframes': [{'time': float(t), 'position': [float(x), float(y)]}
+                          for t, (x, y) in zip(self.times, self.positions)]
+        }
+
+    @classmethod
+    def from_dict(cls, trajectory_dict):
+        keyframes = trajectory_dict['keyframes']
+        return cls([keyframe['time'] for keyframe in keyframes],
+                   [keyframe['position'] for keyframe in keyframes])
+
+    def save(self, filename):
+        with open(filename, 'w') as f:
+            json.dump(self.to_dict(), f, indent=4)
+
+    @classmethod
+    def load(cls, filename):
+        with open(filename, 'r') as f:
+            trajectory_dict = json.load(f)
+        return cls.from_dict(trajectory_dict)
+
+    @classmethod
+    def pass_by(cls, duration, speed=50.0, distance=5.0):
+        half_path = 0.5 * speed * duration
+        return cls([0.0, duration], [[-half_path, distance], [half_path, distance]])
+
+class Spatializer:
+    def __init__(self, sample_rate, config=None):
+        self.sample_rate = sample_rate
+        self.config = config or SpatialConfig()
+        self.speaker_angles = np.radians(np.asarray(self.config.speaker_angles, dtype=float))[:, None]
+
+    def render(self, sources, length=None):
+        length = length or max(len(audio) for audio, _ in sources)
+        output = np.zeros((self.config.channels, length))
+        for audio, trajectory in sources:
+            for start in range(0, length, self.config.block_size):
+                end = min(start + self.config.block_size, length)
+                output[:, start:end] += self._render_block(audio, trajectory, start, end)
+        return output
+
+    def _render_block(self, audio, trajectory, start, end):
+        n = np.arange(start, end)
+        x, y = trajectory.positions_at(n / self.sample_rate)
+        distance = np.hypot(x, y)
+
+        read_position = n - distance / self.config.speed_of_sound * self.sample_rate
+        index = np.floor(read_position).astype(np.int64)
+        fraction = read_position - index
+        valid = (index >= 0) & (index + 1 < len(audio))
+        index = np.where(valid, index, 0)
+        delayed = np.where(valid, audio[index] * (1 - fraction) + audio[index + 1] * fraction, 0.0)
+
+        gain = self.config.reference_distance / np.maximum(distance, self.config.reference_distance)
+        return self._panning_gains(np.arctan2(x, y)) * (gain * delayed)
+
+    def _panning_gains(self, azimuth):
+        if self.config.channels == 1:
+            return np.ones((1, len(azimuth)))
+        gains = 0.5 * (1 + np.cos(azimuth - self.speaker_angles))
+        return gains / np.maximum(np.sqrt(np.sum(gains ** 2, axis=0)), 1e-12)
+
+def read_mono(filename):
+    sample_rate, data = wavfile.read(filename)
+    if np.issubdtype(data.dtype, np.integer):
+        data = data / float(np.iinfo(data.dtype).max)
+    if data.ndim > 1:
+        data = data.mean(axis=1)
+    return sample_rate, data.astype(np.float64)
+
+def save_to_wav(audio, sample_rate, filename):
+    audio_max = np.max(np.abs(audio))
+    if audio_max > 0:
+        audio = audio / audio_max
+    wavfile.write(filename, sample_rate, np.int16(audio.T * 32767))
+
+def benchmark(audio, sample_rate, config, source_count):
+    duration = len(audio) / sample_rate
+    rng = np.random.default_rng()
+    sources = [(audio, Trajectory.pass_by(duration, rng.uniform(20, 90), rng.uniform(2, 30)))
+               for _ in range(source_count)]
+    start = time.perf_counter()
+    Spatializer(sample_rate, config).render(sources)
+    elapsed = time.perf_counter() - start
+    realtime = source_count * duration / elapsed
+    print(f"{source_count} sources x {duration:.2f} s, {config.channels} channels: "
+          f"{elapsed:.3f} s, {realtime:.1f} source-seconds per second")
+
+def main():
+    parser = argparse.ArgumentParser(description="Spatialize a mono sound along a source trajectory")
+    parser.add_argument("input", help="Mono input WAV filename")
+    parser.add_argument("--output", "-o", default="pass-by.wav", help="Output WAV filename")
+    parser.add_argument("--trajectory", "-t", help="Trajectory JSON file, defaults to a straight pass-by")
+    parser.add_argument("--speed", type=float, default=50.0, help="Pass-by speed in m/s")
+    parser.add_argument("--distance", type=float, default=5.0, help="Pass-by closest distance in meters")
+    parser.add_argument("--config", "-c", default="spatial.json", help="Spatial configuration JSON file")
+    parser.add_argument("--channels", type=int, help="Number of output channels, overrides the configuration")
+    parser.add_argument("--benchmark", type=int, metavar="SOURCES", help="Measure throughput with this many pass-by sources")
+    args = parser.parse_args()
+
+    config = SpatialConfig.load(args.config) if os.path.exists(args.config) else SpatialConfig()
+    if args.channels:
+        config = SpatialConfig(args.channels, None, config.speed_of_sound,
+                               config.reference_distance, config.block_size)
+
+    sample_rate, audio = read_mono(args.input)
+    if args.benchmark:
+        benchmark(audio, sample_rate, config, args.benchmark)
+        return
+
+    if args.trajectory:
+        trajectory = Trajectory.load(args.trajectory)
+    else:
+        trajectory = Trajectory.pass_by(len(audio) / sample_rate, args.speed, args.distance)
+
+    spatial = Spatializer(sample_rate, config).render([(audio, trajectory)])
+    save_to_wav(spatial, sample_rate, args.output)
+    print(f"Spatialized sound saved to {args.output}")
+
+if __name__ == "__main__":
+    main()